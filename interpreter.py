@@ -1,5 +1,10 @@
 import re
 import os
+import math
+import types
+import inspect
+import builtins
+import operator
 import argparse
 import tkinter
 
@@ -10,30 +15,85 @@ args = parser.parse_args()
 
 home_dir = os.path.expanduser("~")
 
+# Loaded .epp libraries keyed by (path, mtime), so repeated includes skip compile and exec
+_EPP_CACHE = {}
+
+# Statement and expression patterns, compiled once at module load
+EXT_CALL_RE = re.compile(r"([a-zA-Z_][a-zA-Z0-9_]*):([a-zA-Z_][a-zA-Z0-9_]*)\((.*)\)")
+IF_RE = re.compile(r"if \[(.+?)\] then \[")
+OR_RE = re.compile(r"or \[(.+?)\] then \[")
+ELSE_RE = re.compile(r"else \[")
+
+# EL comparison operators mapped to their Python implementations
+CONDITION_OPERATORS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+# Kinds of compiled IF conditions (see ELInterpreter._compile_condition)
+COND_COMPARE = 0     # (var_name, left_expr, compare_func, operator_str, right_expr)
+COND_TRUTHY = 1      # expr
+COND_INVALID = 2     # message printed when the condition is evaluated
+
+# Kinds of compiled expressions (see ELInterpreter._compile_expression)
+EXPR_LIT = 0         # value (int, float or str literal)
+EXPR_VAR = 1         # (name, code); a bare identifier, usually a variable
+EXPR_EXT_CALL = 2    # ((library_name, function_name), arg_specs)
+EXPR_EVAL = 3        # (expr_str, code); code is None if expr_str is not valid Python
+
+# Opcodes for the lowered program representation (see ELInterpreter._compile_line)
+OP_NOP = 0           # Closing bracket of an IF's last branch, 'else [' lines
+OP_DEFINE = 1        # (var_name, expr); lowered from both 'local' and 'global'
+OP_SET = 2           # (var_name, expr)
+OP_SET_EXT_CALL = 3  # (var_name, (library_name, function_name), arg_specs)
+OP_EXT_CALL = 4      # ((library_name, function_name), arg_specs)
+OP_JUMP = 5          # target_index
+OP_JUMP_IF_FALSE = 6 # (condition, false_target_index); lowered from if/or headers
+OP_INCLUDE = 7       # file_to_include
+OP_ERROR = 8         # message printed when the line is reached
+OP_HALT = 9          # message printed before the program stops
+OP_FUSED_BLOCK = 10  # (code, length, first_instruction); runs `length` assignment lines as one code object
+OP_EXT_CALL_CONST = 11 # ((library_name, function_name), args); every argument is a literal
+
 class ELInterpreter:
     """
     ELInterpreter: An interpreter for the Extendable Language (EL).
     """
 
+    # Fixed attribute layout: faster attribute access on the hot path, no per-instance __dict__
+    __slots__ = ('vars', 'labels', 'program_lines', 'code', 'current_line_index',
+                 'extensions', 'debug', '_expr_cache', '_method_cache', '_run',
+                 '_bracket_deltas')
+
     def __init__(self, debug=False):
         """
-        Initializes the interpreter's state, including variable scopes,
+        Initializes the interpreter's state, including variables,
         labels, program lines, current execution index, and loaded extensions.
 
         Args:
             debug (bool): If True, enables debug print statements. Defaults to False.
         """
-        self.globals = {}          # Global variables
-        self.locals = {}           # Local variables
-        self.labels = {}           # Maps label names to line indices
+        self.vars = {}             # All variables; 'local' and 'global' share one namespace
+        self.labels = {}           # Maps label names to the index of the line after them
         self.program_lines = []    # List of processed program lines
-        self.current_line_index = 0 # Current line being executed
-        self.extensions = {}       # Stores loaded extension classes/objects
+        self.code = []             # (opcode, payload) for each program line
+        self.current_line_index = 0 # Line index where the last run stopped
+        self.extensions = {}       # Maps library names to {function_name: callable}
+        self._expr_cache = {}      # Maps expression strings to compiled code objects
+        self._method_cache = {}    # Maps (library_name, function_name) to the resolved callable
+        self._bracket_deltas = []  # Per program line: count of '[' minus count of ']'
         self.debug = debug         # Debug flag
+        # Pick the run loop once, so the non-debug loop never tests the flag
+        self._run = self._run_debug if debug else self._run_fast
 
     def load_program(self, el_code):
         """
-        Loads the EL program code, preprocesses it, and maps labels.
+        Loads the EL program code, preprocesses it, maps labels and lowers
+        every line to an (opcode, payload) tuple so `run()` never re-parses source.
 
         Args:
             el_code (str): The raw EL program code as a string.
@@ -45,8 +105,16 @@ class ELInterpreter:
             # Keep lines that are labels (@name) or non-comment, non-empty lines
             if stripped_line.startswith('@') or (not stripped_line.startswith(';') and stripped_line):
                 processed_lines.append(stripped_line)
-        self.program_lines = processed_lines
-        self._map_labels()
+        self.program_lines = self._map_labels(processed_lines)
+        self._bracket_deltas = [line.count('[') - line.count(']') for line in self.program_lines]
+        self.code = [None] * len(self.program_lines)
+        for i in range(len(self.program_lines)):
+            # IF statements fill in their or/else/closing lines ahead of time
+            if self.code[i] is None:
+                self.code[i] = self._compile_line(i)
+        # Fused blocks skip the per-line trace, so keep every line separate when debugging
+        if not self.debug:
+            self._fuse_blocks()
 
         if self.debug:
             print(f"\n--- Debug: Program Lines ---")
@@ -54,201 +122,159 @@ class ELInterpreter:
                 print(f"{i}: {line}")
             print(f"--- Debug: Mapped Labels ---")
             print(self.labels)
+            print(f"--- Debug: Compiled Code ---")
+            for i, instruction in enumerate(self.code):
+                print(f"{i}: {instruction}")
             print(f"----------------------------\n")
 
 
-    def _map_labels(self):
+    def _map_labels(self, lines):
         """
-        Scans the program lines to identify and store label names with their
-        corresponding line numbers in the `self.labels` dictionary.
+        Removes label lines from the program and stores each label name in the
+        `self.labels` dictionary with the index of the next real instruction,
+        so labels cost nothing at run time.
         Labels are stored without the leading '@' symbol.
+
+        Args:
+            lines (list): Processed program lines, including label lines.
+
+        Returns:
+            list: The program lines without labels.
         """
-        for i, line in enumerate(self.program_lines):
+        instruction_lines = []
+        for line in lines:
             if line.startswith('@'):
                 label_name = line[1:]
-                self.labels[label_name] = i
+                self.labels[label_name] = len(instruction_lines)
+            else:
+                instruction_lines.append(line)
+        return instruction_lines
 
-    def run(self):
-        """
-        Executes the loaded EL program line by line.
-        Handles program flow, including jumps and complex IF statements.
+    def _compile_line(self, index):
         """
-        self.current_line_index = 0
-        while self.current_line_index < len(self.program_lines):
-            line = self.program_lines[self.current_line_index].strip()
+        Parses a single program line once and lowers it to an (opcode, payload) tuple.
+        The leading keyword selects a compiler from `STATEMENT_COMPILERS`.
+        Syntax errors are not raised here; they become OP_ERROR/OP_HALT instructions
+        so they are reported when (and only if) execution reaches the line.
 
-            # Skip labels during execution; they are just markers for jumps
-            if line.startswith('@'):
-                self.current_line_index += 1
-                continue
-
-            if self.debug:
-                print(f"DEBUG: Executing line {self.current_line_index}: '{line}'")
-
-            # Handle multi-line IF statement separately
-            if line.startswith("if "):
-                next_index_after_if_structure = self._handle_if_statement(self.current_line_index)
-                if next_index_after_if_structure is None:
-                    print(f"Error: Malformed IF statement at line {self.current_line_index}. Halting program.")
-                    break
-                
-                # _handle_if_statement returns the actual next line index, which could be a jump target
-                self.current_line_index = next_index_after_if_structure 
-            else:
-                # For all other single-line statements
-                original_index_before_exec = self.current_line_index # Store to detect jumps
-                self._execute_single_statement(line)
-                
-                if self.current_line_index == original_index_before_exec:
-                    self.current_line_index += 1
+        Args:
+            index (int): Index of the line in `self.program_lines`.
 
-    def _execute_single_statement(self, line):
+        Returns:
+            tuple: (opcode, payload) for the line.
         """
-        Parses and executes a single line of EL code.
-        This method does NOT manage `self.current_line_index` for general program flow;
-        that is handled by the `run()` loop or `_handle_if_statement()`.
-        It WILL modify `self.current_line_index` if a `jump` instruction is executed.
+        line = self.program_lines[index]
 
-        Args:
-            line (str): The EL code line to execute.
-        """
-        # VARIABLE DEFINITION AND SETTING
-        if line.startswith("local "):
-            parts = re.match(r"local (.+) = (.+)", line)
-            if parts:
-                var_name = parts.group(1).strip()
-                value = self._evaluate_expression(parts.group(2).strip(), scope="local")
-                self.locals[var_name] = value
-            else:
-                print(f"Syntax error defining local variable: {line}")
-        elif line.startswith("global "):
-            parts = re.match(r"global (.+) = (.+)", line)
-            if parts:
-                var_name = parts.group(1).strip()
-                value = self._evaluate_expression(parts.group(2).strip(), scope="global")
-                self.globals[var_name] = value
-            else:
-                print(f"Syntax error defining global variable: {line}")
-        elif line.startswith("set "):
-            # Check for 'set var = LIBRARY:FUNCTION(args)' as a specific case first
-            match_set_extension_call = re.match(r"set (.+) = ([a-zA-Z_][a-zA-Z0-9_]*):([a-zA-Z_][a-zA-Z0-9_]*)\((.*)\)", line)
-            if match_set_extension_call:
-                var_name = match_set_extension_call.group(1).strip()
-                library_name = match_set_extension_call.group(2)
-                function_name = match_set_extension_call.group(3)
-                args_str = match_set_extension_call.group(4).strip()
+        # Closing brackets only end IF blocks
+        if line.startswith(']'):
+            return (OP_NOP, None)
 
-                if self.debug:
-                    print(f"DEBUG: SET Extension Call - Looking for '{library_name}'. Extensions: {list(self.extensions.keys())}")
-                    if library_name not in self.extensions:
-                        print(f"DEBUG: !!! CRITICAL: '{library_name}' is NOT in self.extensions here. This is the source of the error.")
-
-
-                if library_name in self.extensions:
-                    library_obj = self.extensions[library_name]
-                    if hasattr(library_obj, function_name):
-                        func = getattr(library_obj, function_name)
-                        args = []
-                        if args_str:
-                            raw_args = [arg.strip() for arg in args_str.split(',')]
-                            for arg_item in raw_args:
-                                args.append(self._evaluate_expression(arg_item))
-                        try:
-                            result = func(*args)
-                            self._assign_variable(var_name, result)
-                        except Exception as e:
-                            print(f"Error calling extension function {library_name}:{function_name} for assignment: {e}")
-                    else:
-                        print(f"Error: Function '{function_name}' not found in library '{library_name}' for assignment.")
-                else:
-                    print(f"Error: Extension library '{library_name}' not found for assignment.")
-            else:
-                parts = re.match(r"set (.+) = (.+)", line)
-                if parts:
-                    var_name = parts.group(1).strip()
-                    value = self._evaluate_expression(parts.group(2).strip())
-                    self._assign_variable(var_name, value)
-                else:
-                    print(f"Syntax error setting variable: {line}")
+        head, separator, rest = line.partition(' ')
+        if separator and head in STATEMENT_COMPILERS:
+            return STATEMENT_COMPILERS[head](self, index, line, rest)
 
         # STANDALONE EXTENSION FUNCTION CALLS (not assigned)
-        elif re.match(r"([a-zA-Z_][a-zA-Z0-9_]*):([a-zA-Z_][a-zA-Z0-9_]*)\((.*)\)", line):
-            self._evaluate_expression(line.strip())
+        match_extension_call = EXT_CALL_RE.match(line)
+        if match_extension_call:
+            method_key = (match_extension_call.group(1), match_extension_call.group(2))
+            arg_specs = self._compile_arguments(match_extension_call.group(3).strip())
+            # Literal-only calls keep their argument values ready to unpack
+            if all(kind == EXPR_LIT for kind, _ in arg_specs):
+                return (OP_EXT_CALL_CONST, (method_key, tuple(value for _, value in arg_specs)))
+            return (OP_EXT_CALL, (method_key, arg_specs))
 
-        # FLOW CONTROL (only jump here; if statements handled in run())
-        elif line.startswith("jump "):
-            label = line[len("jump "):].strip()
-            target_label_name = label[1:]
-            if self.debug:
-                print(f"DEBUG: jump - Looking for label '{target_label_name}'. self.labels: {self.labels}")
-            if target_label_name in self.labels:
-                # Set current_line_index directly. The calling context (run or _handle_if_statement)
-                # will then pick up from this new index.
-                self.current_line_index = self.labels[target_label_name] 
-                if self.debug:
-                    print(f"DEBUG: Jumped to line {self.current_line_index} (@{target_label_name})")
-            else:
-                print(f"Error: Label '{label}' not found for jump.")
-                self.current_line_index = len(self.program_lines) # Effectively ends the program on error
+        return (OP_ERROR, f"Unknown command or syntax error: {line}")
 
-        # EXTENSIONS
-        elif line.startswith(".include "):
-            file_to_include = line[len(".include "):].strip().replace('~', f'{home_dir}/lib')
-            if (file_to_include.startswith('"') and file_to_include.endswith('"')) or \
-               (file_to_include.startswith("'") and file_to_include.endswith("'")):
-                file_to_include = file_to_include[1:-1]
+    # --- Statement compilers: each takes (index, line, rest after the keyword) ---
 
-            if file_to_include.endswith(".epp"):
-                try:
-                    # Use file_to_include directly, as the EL program provides the full path (e.g., "lib/stdio.epp")
-                    full_path = file_to_include 
-                    with open(full_path, 'r') as f:
-                        epp_content_from_file = f.read()
-                    
-                    epp_globals = {}
-                    exec(epp_content_from_file, epp_globals)
+    def _split_assignment(self, rest):
+        """
+        Splits 'NAME = EXPRESSION' at the first '='.
 
-                    for name, obj in epp_globals.items():
-                        if isinstance(obj, type) and name != '__builtins__':
-                            self.extensions[name] = obj # Store the class object itself
-                    if self.debug:
-                        print(f"DEBUG: Included EPP file '{full_path}'. Loaded extensions: {list(self.extensions.keys())}")
-                        if 'stdio' in self.extensions:
-                            print(f"DEBUG: 'stdio' confirmed in self.extensions after include: {self.extensions['stdio']}")
-
-                except FileNotFoundError:
-                    print(f"Error: EPP file '{full_path}' not found. Make sure the path is correct.")
-                except Exception as e:
-                    print(f"Error executing EPP file '{full_path}': {e}")
-            else:
-                print(f"Error: Can only include .epp files. Found: {file_to_include}")
-        else:
-            if not line.startswith("]"): print(f"Unknown command or syntax error: {line}")
+        Args:
+            rest (str): The statement text after its keyword.
 
-    def _handle_if_statement(self, start_line_index):
+        Returns:
+            tuple: (var_name, expr_str), or None if either side is missing.
         """
-        Parses the entire multi-line if/or/else statement structure,
-        executes the first matching block, and returns the next line index
-        for the main run loop to continue, or None on error.
+        var_name, separator, expr_str = rest.partition('=')
+        var_name = var_name.strip()
+        expr_str = expr_str.strip()
+        # 'x == y' is a comparison, not an assignment
+        if not separator or not var_name or not expr_str or expr_str.startswith('='):
+            return None
+        return var_name, expr_str
+
+    def _compile_local(self, index, line, rest):
+        parts = self._split_assignment(rest)
+        if parts:
+            return (OP_DEFINE, (parts[0], self._compile_expression(parts[1])))
+        return (OP_ERROR, f"Syntax error defining local variable: {line}")
+
+    def _compile_global(self, index, line, rest):
+        parts = self._split_assignment(rest)
+        if parts:
+            return (OP_DEFINE, (parts[0], self._compile_expression(parts[1])))
+        return (OP_ERROR, f"Syntax error defining global variable: {line}")
+
+    def _compile_set(self, index, line, rest):
+        parts = self._split_assignment(rest)
+        if not parts:
+            return (OP_ERROR, f"Syntax error setting variable: {line}")
+        var_name, expr_str = parts
+        # Check for 'set var = LIBRARY:FUNCTION(args)' as a specific case first
+        match_extension_call = EXT_CALL_RE.match(expr_str)
+        if match_extension_call:
+            return (OP_SET_EXT_CALL, (var_name,
+                                      (match_extension_call.group(1), match_extension_call.group(2)),
+                                      self._compile_arguments(match_extension_call.group(3).strip())))
+        return (OP_SET, (var_name, self._compile_expression(expr_str)))
+
+    def _compile_jump(self, index, line, rest):
+        # Resolve the label now so a jump at run time is just a new pc
+        label = rest.strip()
+        target_label_name = label[1:]
+        if target_label_name not in self.labels:
+            raise NameError(f"Label '{label}' not found for jump (line {index}).")
+        return (OP_JUMP, self.labels[target_label_name])
+
+    def _compile_include(self, index, line, rest):
+        file_to_include = rest.strip().replace('~', f'{home_dir}/lib')
+        if (file_to_include.startswith('"') and file_to_include.endswith('"')) or \
+           (file_to_include.startswith("'") and file_to_include.endswith("'")):
+            file_to_include = file_to_include[1:-1]
+        return (OP_INCLUDE, file_to_include)
+
+    def _compile_if(self, start_line_index, line, rest):
         """
-        parsed_branches = [] # List to store (condition_str, block_start_idx, block_end_exclusive_for_range)
+        Parses the entire multi-line if/or/else statement structure starting at
+        `start_line_index` and lowers it to a chain of conditional jumps:
+        each 'if'/'or' header jumps past its block when its condition is false,
+        and each block's closing ']' jumps past the whole structure. The 'or',
+        'else' and ']' instructions are written into `self.code` directly.
+
+        Returns:
+            tuple: (OP_JUMP_IF_FALSE, (condition, false_target_index)) for the
+            'if' line, or (OP_HALT, message) if the header cannot be parsed or
+            a block is never closed.
+        """
+        parsed_branches = [] # List to store (header_idx, condition, block_end_exclusive_for_range)
         current_line_for_parsing = start_line_index
 
-        # --- Phase 1: Parse all IF, OR, and ELSE branches ---
         while current_line_for_parsing < len(self.program_lines):
-            line = self.program_lines[current_line_for_parsing].strip()
+            line = self.program_lines[current_line_for_parsing]
 
             condition_text = None
             
             # The 'if' must start at the beginning of the `if` construct
             if current_line_for_parsing == start_line_index:
-                match = re.match(r"if \[(.+?)\] then \[", line)
+                match = IF_RE.match(line)
             else: # 'or' and 'else' can follow
-                match = re.match(r"or \[(.+?)\] then \[", line)
+                match = OR_RE.match(line)
             
             if match:
                 condition_text = match.group(1).strip()
-            elif re.match(r"else \[", line): # 'else' without a condition
+            elif ELSE_RE.match(line): # 'else' without a condition
                 condition_text = "ELSE"
             else:
                 # If it's not an IF, OR, or ELSE continuation, we've parsed the entire structure.
@@ -259,11 +285,11 @@ class ELInterpreter:
             # _find_block_end returns the exclusive end index for the range
             block_end_exclusive, success = self._find_block_end(block_content_start) 
             if not success:
-                print(f"Syntax error: Unclosed block for '{line}' starting near line {current_line_for_parsing}")
-                return None
+                return (OP_HALT, f"Syntax error: Unclosed block for '{line}' starting near line {current_line_for_parsing}\n"
+                                 f"Error: Malformed IF statement at line {start_line_index}. Halting program.")
             
-            # Store the range for block content (exclusive of the closing bracket line itself)
-            parsed_branches.append((condition_text, block_content_start, block_end_exclusive))
+            condition = None if condition_text == "ELSE" else self._compile_condition(condition_text)
+            parsed_branches.append((current_line_for_parsing, condition, block_end_exclusive))
             
             # Move parsing cursor to the line *after* the current block (its closing ']')
             current_line_for_parsing = block_end_exclusive
@@ -272,62 +298,316 @@ class ELInterpreter:
             if condition_text == "ELSE":
                 break
         
-        # 'overall_if_end_index' now holds the index of the line immediately after the entire if-structure.
+        if not parsed_branches:
+            return (OP_HALT, f"Syntax error: Invalid IF header '{line}' (expected 'if [condition] then [')\n"
+                             f"Error: Malformed IF statement at line {start_line_index}. Halting program.")
+
+        # 'current_line_for_parsing' now holds the index of the line immediately after the entire if-structure.
         overall_if_end_index = current_line_for_parsing
 
-        # --- Phase 2: Execute the first matching branch ---
-        # Store original index to detect if a jump happened *during* block execution
-        original_current_line_index_at_entry = self.current_line_index 
+        for header_idx, condition, block_end_exclusive in parsed_branches:
+            # A false condition skips to the next branch's header (or past the structure)
+            if condition is None:
+                self.code[header_idx] = (OP_NOP, None)
+            else:
+                self.code[header_idx] = (OP_JUMP_IF_FALSE, (condition, block_end_exclusive))
+            # Finishing a block skips the remaining branches
+            if block_end_exclusive == overall_if_end_index:
+                self.code[block_end_exclusive - 1] = (OP_NOP, None)
+            else:
+                self.code[block_end_exclusive - 1] = (OP_JUMP, overall_if_end_index)
+        return self.code[start_line_index]
+
+    def _fuse_blocks(self):
+        """
+        Replaces the first instruction of every straight-line run of two or more
+        plain assignments with an OP_FUSED_BLOCK, which executes the whole run as
+        one compiled Python code object instead of one dispatch per line.
+        Runs are split at jump targets so a loop body gets its own block. The
+        instructions after the first stay in place for the block's fallback to
+        resume at; the displaced first one is kept in the block's payload.
+        """
+        defined_names = {arg[0] for op, arg in self.code if op == OP_DEFINE}
+        jump_targets = {arg for op, arg in self.code if op == OP_JUMP}
+        jump_targets.update(arg[1] for op, arg in self.code if op == OP_JUMP_IF_FALSE)
+
+        block_lines = []
+        for i in range(len(self.code) + 1):
+            source = self._fused_source(self.code[i], defined_names) if i < len(self.code) else None
+            if source is None or i in jump_targets:
+                if len(block_lines) >= 2:
+                    block_code = compile('\n'.join(block_lines), '<el-block>', 'exec')
+                    start = i - len(block_lines)
+                    self.code[start] = (OP_FUSED_BLOCK, (block_code, len(block_lines), self.code[start]))
+                block_lines = []
+            if source is not None:
+                block_lines.append(source)
+
+    def _fused_source(self, instruction, defined_names):
+        """
+        Translates an OP_DEFINE/OP_SET instruction into one line of Python source.
+
+        Args:
+            instruction (tuple): The compiled (opcode, payload) instruction.
+            defined_names (set): Every variable name defined anywhere in the program.
+
+        Returns:
+            str: The equivalent Python statement, or None if the instruction can't
+            be fused without changing its EL semantics.
+        """
+        op, arg = instruction
+        if op != OP_DEFINE and op != OP_SET:
+            return None
+        var_name, (kind, payload) = arg
+        if not var_name.isidentifier():
+            return None
+
+        if kind == EXPR_LIT:
+            if not (type(payload) in (int, str) or (type(payload) is float and math.isfinite(payload))):
+                return None
+            value_source = repr(payload)
+        elif kind == EXPR_VAR or kind == EXPR_EVAL:
+            expr_str, code = payload
+            # Only plain operations on the program's own variables: no builtins, attributes
+            # or nested scopes, and no expression text that is itself a variable name
+            if code is None or (kind == EXPR_EVAL and expr_str in defined_names) \
+               or not all(name in defined_names for name in code.co_names) \
+               or any(isinstance(const, types.CodeType) for const in code.co_consts):
+                return None
+            value_source = f"({expr_str})"
+        else:
+            return None
 
-        block_executed = False
-        for cond_text, block_start_idx, block_end_exclusive in parsed_branches:
-            if cond_text == "ELSE" or self._evaluate_condition(cond_text):
+        if op == OP_DEFINE:
+            source = f"{var_name} = {value_source}"
+        elif hasattr(builtins, var_name):
+            return None # Reading the name would find the builtin instead of failing
+        else:
+            # Reading the name first raises NameError if the variable isn't defined yet,
+            # which hands the line back to _op_set to report
+            source = f"{var_name}; {var_name} = {value_source}"
+
+        try:
+            compile(source, '<el-block>', 'exec')
+        except (SyntaxError, ValueError):
+            return None # e.g. a keyword used as a variable name
+        return source
+
+    def run(self):
+        """
+        Executes the compiled EL program, dispatching each instruction to its
+        handler in `OP_HANDLERS`. Every handler returns the index of the next
+        instruction, so jumps and IF statements need no special casing here.
+        """
+        self._run()
+
+    def _run_fast(self):
+        code = self.code
+        program_length = len(code)
+        pc = 0
+        while pc < program_length:
+            op, arg = code[pc]
+            pc = OP_HANDLERS[op](self, arg, pc)
+        self.current_line_index = pc
+
+    def _run_debug(self):
+        # Same loop as _run_fast, with tracing and the handlers from DEBUG_OP_HANDLERS
+        code = self.code
+        program_length = len(code)
+        pc = 0
+        while pc < program_length:
+            op, arg = code[pc]
+            if op != OP_NOP:
+                print(f"DEBUG: Executing line {pc}: '{self.program_lines[pc]}'")
+            pc = DEBUG_OP_HANDLERS[op](self, arg, pc)
+        self.current_line_index = pc
+
+    # --- Opcode handlers: each takes (payload, pc) and returns the next pc ---
+
+    def _op_nop(self, arg, pc):
+        return pc + 1
+
+    def _op_define(self, arg, pc):
+        var_name, expr = arg
+        self.vars[var_name] = self._evaluate_expression(expr)
+        return pc + 1
+
+    def _op_set(self, arg, pc):
+        var_name, expr = arg
+        self._assign_variable(var_name, self._evaluate_expression(expr))
+        return pc + 1
+
+    def _op_set_ext_call(self, arg, pc):
+        var_name, method_key, arg_specs = arg
+        func = self._method_cache.get(method_key)
+        if func is None:
+            func = self._resolve_extension(method_key, " for assignment")
+            if func is None:
+                return pc + 1
+        args = [self._evaluate_expression(arg_item) for arg_item in arg_specs]
+        try:
+            result = func(*args)
+            self._assign_variable(var_name, result)
+        except Exception as e:
+            print(f"Error calling extension function {method_key[0]}:{method_key[1]} for assignment: {e}")
+        return pc + 1
+
+    def _op_ext_call(self, arg, pc):
+        self._call_extension(*arg)
+        return pc + 1
+
+    def _op_ext_call_const(self, arg, pc):
+        method_key, args = arg
+        func = self._method_cache.get(method_key)
+        if func is None:
+            func = self._resolve_extension(method_key)
+            if func is None:
+                return pc + 1
+        try:
+            func(*args)
+        except Exception as e:
+            print(f"Error calling extension function {method_key[0]}:{method_key[1]}: {e}")
+        return pc + 1
+
+    def _op_jump(self, arg, pc):
+        return arg
+
+    def _op_jump_if_false(self, arg, pc):
+        condition, false_target = arg
+        if self._evaluate_condition(condition):
+            return pc + 1
+        return false_target
+
+    def _op_include(self, arg, pc):
+        file_to_include = arg
+        if file_to_include.endswith(".epp"):
+            try:
+                # Use file_to_include directly, as the EL program provides the full path (e.g., "lib/stdio.epp")
+                full_path = file_to_include 
+                cache_key = (full_path, os.path.getmtime(full_path))
+                libraries = _EPP_CACHE.get(cache_key)
+                if libraries is None:
+                    with open(full_path, 'r') as f:
+                        epp_code = compile(f.read(), full_path, 'exec')
+                    epp_globals = {}
+                    exec(epp_code, epp_globals)
+                    libraries = {}
+                    for name, obj in epp_globals.items():
+                        if isinstance(obj, type) and name != '__builtins__':
+                            functions = self._load_extension(obj)
+                            if functions is not None:
+                                libraries[name] = functions
+                    _EPP_CACHE[cache_key] = libraries
+
+                # Re-included libraries may replace functions that were already cached
+                self._method_cache = {key: func for key, func in self._method_cache.items()
+                                      if key[0] not in libraries}
+                for name, functions in libraries.items():
+                    self.extensions[name] = functions
+                    for function_name, func in functions.items():
+                        self._method_cache[(name, function_name)] = func
                 if self.debug:
-                    # Adjusted debug print for clarity
-                    print(f"DEBUG: Executing branch (Condition: '{cond_text}') from line {block_start_idx} to {block_end_exclusive - 1}")
-                
-                # Execute lines within this block (from block_start_idx up to block_end_exclusive - 1)
-                block_exec_idx = block_start_idx
-                while block_exec_idx < (block_end_exclusive -1): # CORRECTED: Ensure ']' line is not executed
-                    nested_line = self.program_lines[block_exec_idx].strip()
-
-                    # Handle nested IF statements recursively
-                    if nested_line.startswith("if "):
-                        # Set interpreter's global index for nested call (important for label lookups inside nested if)
-                        self.current_line_index = block_exec_idx 
-                        
-                        next_index_after_nested_if = self._handle_if_statement(block_exec_idx)
-                        
-                        if next_index_after_nested_if is None:
-                            return None # Propagate error
-                        
-                        # Advance past the nested if-structure for the current block execution
-                        block_exec_idx = next_index_after_nested_if 
-                        
-                        # If a jump happened inside the nested IF, it overrides the normal flow
-                        # and we must return that new jump target immediately to the top-level `run`.
-                        if self.current_line_index != original_current_line_index_at_entry:
-                             if self.debug:
-                                print(f"DEBUG: Jump detected inside nested IF. Returning new target: {self.current_line_index}")
-                             return self.current_line_index
-                    else:
-                        # Execute other non-IF statements normally
-                        self._execute_single_statement(nested_line)
-                        
-                        # If a jump occurred, it overrides the normal flow
-                        if self.current_line_index != original_current_line_index_at_entry:
-                            if self.debug:
-                                print(f"DEBUG: Jump detected inside block. Returning new target: {self.current_line_index}")
-                            return self.current_line_index
-                        
-                        block_exec_idx += 1 # Move to the next line in the current block
-
-                block_executed = True
-                break # Exit after executing the first matching block
-
-        # --- Phase 3: Determine the next line for the main loop ---
-        # If no jump occurred within any executed block, we should continue after the entire if-structure.
-        return overall_if_end_index
+                    print(f"DEBUG: Included EPP file '{full_path}'. Loaded extensions: {list(self.extensions.keys())}")
+                    if 'stdio' in self.extensions:
+                        print(f"DEBUG: 'stdio' confirmed in self.extensions after include: {self.extensions['stdio']}")
+
+            except FileNotFoundError:
+                print(f"Error: EPP file '{full_path}' not found. Make sure the path is correct.")
+            except Exception as e:
+                print(f"Error executing EPP file '{full_path}': {e}")
+        else:
+            print(f"Error: Can only include .epp files. Found: {file_to_include}")
+        return pc + 1
+
+    def _load_extension(self, library_class):
+        """
+        Instantiates an extension library class once and collects its public callables,
+        so calls never walk the class MRO. Classes whose constructor requires
+        arguments are used as-is, which still exposes their static and class methods.
+
+        Args:
+            library_class (type): A class defined by an included .epp file.
+
+        Returns:
+            dict: Maps function names to bound callables, or None if the constructor raised.
+        """
+        needs_arguments = False
+        try:
+            inspect.signature(library_class).bind()
+        except TypeError:
+            needs_arguments = True
+        except ValueError:
+            pass # No introspectable signature, so just try constructing it
+        try:
+            library_obj = library_class if needs_arguments else library_class()
+        except Exception as e:
+            print(f"Error initializing extension library '{library_class.__name__}': {e}")
+            return None
+        functions = {}
+        for function_name in dir(library_obj):
+            if not function_name.startswith('_'):
+                func = getattr(library_obj, function_name)
+                if callable(func):
+                    functions[function_name] = func
+        return functions
+
+    def _op_error(self, arg, pc):
+        print(arg)
+        return pc + 1
+
+    def _op_halt(self, arg, pc):
+        print(arg)
+        return len(self.code)
+
+    def _op_fused_block(self, arg, pc):
+        block_code, length, first_instruction = arg
+        try:
+            exec(block_code, {}, self.vars)
+        except Exception as e:
+            # Resume at the line that failed so its own instruction runs (and reports) it;
+            # every line before it has already completed
+            tb = e.__traceback__
+            while tb is not None and tb.tb_frame.f_code is not block_code:
+                tb = tb.tb_next
+            failed_offset = tb.tb_lineno - 1 if tb is not None else 0
+            if failed_offset > 0:
+                return pc + failed_offset
+            # The first line's slot holds this block, so run its instruction directly
+            op, first_arg = first_instruction
+            return OP_HANDLERS[op](self, first_arg, pc)
+        return pc + length
+
+    # --- Debug variants of opcode handlers, used only by _run_debug ---
+
+    def _debug_op_set_ext_call(self, arg, pc):
+        library_name = arg[1][0]
+        print(f"DEBUG: SET Extension Call - Looking for '{library_name}'. Extensions: {list(self.extensions.keys())}")
+        if library_name not in self.extensions:
+            print(f"DEBUG: !!! CRITICAL: '{library_name}' is NOT in self.extensions here. This is the source of the error.")
+        return self._op_set_ext_call(arg, pc)
+
+    def _debug_op_ext_call(self, arg, pc):
+        method_key, arg_specs = arg
+        result = self._call_extension(method_key, arg_specs)
+        print(f"DEBUG: Extension call '{method_key[0]}:{method_key[1]}' returned: {result}")
+        return pc + 1
+
+    def _debug_op_ext_call_const(self, arg, pc):
+        method_key, args = arg
+        print(f"DEBUG: Extension call '{method_key[0]}:{method_key[1]}' with constant arguments {list(args)}")
+        return self._op_ext_call_const(arg, pc)
+
+    def _debug_op_jump(self, arg, pc):
+        print(f"DEBUG: Jumped to line {arg} ({self.program_lines[arg] if arg < len(self.program_lines) else 'end of program'})")
+        return arg
+
+    def _debug_op_jump_if_false(self, arg, pc):
+        condition, false_target = arg
+        result = self._evaluate_condition(condition)
+        print(f"DEBUG: Condition on line {pc} evaluated to {result}")
+        if result:
+            return pc + 1
+        return false_target
 
     def _find_block_end(self, start_line_of_block_content):
         """
@@ -338,12 +618,11 @@ class ELInterpreter:
         """
         # We start with a balance of 1 because the current block started with an implicit '[' (from 'then [' etc.)
         bracket_balance = 1 
+        bracket_deltas = self._bracket_deltas
         
-        for i in range(start_line_of_block_content, len(self.program_lines)):
-            line = self.program_lines[i].strip()
-            
-            bracket_balance += line.count('[')
-            bracket_balance -= line.count(']')
+        for i in range(start_line_of_block_content, len(bracket_deltas)):
+            # Deltas are counted once per line in load_program
+            bracket_balance += bracket_deltas[i]
             
             if bracket_balance == 0:
                 # Found the closing ']' for the block. Return the index of the line *after* it.
@@ -352,176 +631,287 @@ class ELInterpreter:
         # If loop finishes and balance is not 0, it means block was unclosed
         return -1, False 
 
-    def _evaluate_expression(self, expr_str, scope=None):
+    def _compile_expression(self, expr_str):
         """
-        Evaluates an expression string, which can be a literal, a variable,
+        Classifies an expression string once at load time as a literal, a variable,
         a function call from an extension, or a simple mathematical expression.
 
         Args:
-            expr_str (str): The expression string to evaluate.
-            scope (str, optional): Hints the current scope ('local' or 'global')
-                                   for variable lookup. Defaults to None (checks both).
+            expr_str (str): The expression string to compile.
 
         Returns:
-            The evaluated value (int, float, str, or result of function call).
+            tuple: (kind, payload), evaluated at run time by `_evaluate_expression`.
         """
         # 1. Try to convert to int/float first (for numeric literals)
         try:
-            return int(expr_str)
+            return (EXPR_LIT, int(expr_str))
         except ValueError:
             try:
-                return float(expr_str)
+                return (EXPR_LIT, float(expr_str))
             except ValueError:
                 # 2. Check for string literals (enclosed in quotes)
                 if (expr_str.startswith('"') and expr_str.endswith('"')) or \
                    (expr_str.startswith("'") and expr_str.endswith("'")):
-                    return expr_str[1:-1]
+                    return (EXPR_LIT, expr_str[1:-1])
 
         # 3. Check for LIBRARY:FUNCTION() or LIBRARY:FUNCTION(args) pattern (Extension calls)
-        match_extension_call = re.match(r"([a-zA-Z_][a-zA-Z0-9_]*):([a-zA-Z_][a-zA-Z0-9_]*)\((.*)\)", expr_str)
+        match_extension_call = EXT_CALL_RE.match(expr_str)
         if match_extension_call:
-            library_name = match_extension_call.group(1)
-            function_name = match_extension_call.group(2)
-            args_str = match_extension_call.group(3).strip()
-
-            if library_name in self.extensions:
-                library_obj = self.extensions[library_name]
-                if hasattr(library_obj, function_name):
-                    func = getattr(library_obj, function_name)
-
-                    args = []
-                    if args_str: # If there are arguments
-                        # This split already supports multiple arguments separated by commas.
-                        raw_args = [arg.strip() for arg in args_str.split(',')]
-                        for arg_item in raw_args:
-                            # Recursively evaluate each argument before passing to the function
-                            args.append(self._evaluate_expression(arg_item)) 
-
-                    try:
-                        result = func(*args) # Call the Python function with unpacked arguments
-                        if self.debug:
-                            print(f"DEBUG: Extension call '{library_name}:{function_name}({args_str})' returned: {result}")
-                        return result
-                    except Exception as e:
-                        print(f"Error calling extension function {library_name}:{function_name}: {e}")
-                        return None # Return None on error, or raise a custom EL error
-                else:
-                    print(f"Error: Function '{function_name}' not found in library '{library_name}'.")
-                    return None
-            else:
-                print(f"Error: Extension library '{library_name}' not found.")
-                return None
+            return (EXPR_EXT_CALL, ((match_extension_call.group(1), match_extension_call.group(2)),
+                                    self._compile_arguments(match_extension_call.group(3).strip())))
 
-        # 4. Finally, try to evaluate as a variable or a general Python expression
-        if scope == "local" and expr_str in self.locals:
-            return self.locals[expr_str]
-        elif scope == "global" and expr_str in self.globals:
-            return self.globals[expr_str]
-        elif expr_str in self.locals: 
-            return self.locals[expr_str]
-        elif expr_str in self.globals:
-            return self.globals[expr_str]
+        # 4. Finally, it is a variable or a general Python expression. Each distinct
+        # expression is only parsed and compiled once; None marks text that isn't valid Python.
+        if expr_str in self._expr_cache:
+            code = self._expr_cache[expr_str]
         else:
             try:
-                # Attempt to evaluate as a general Python expression if it's not a variable or literal
-                # Provide both globals and locals to eval's namespace
-                combined_namespace = {**self.globals, **self.locals}
-                return eval(expr_str, {}, combined_namespace)
-            except (NameError, SyntaxError, TypeError) as e:
-                # If evaluation fails, it might be an unrecognized variable name or invalid expression
-                # Or it could be a string literal that wasn't quoted.
-                # For now, return the string itself if it can't be evaluated.
-                if self.debug:
-                    print(f"DEBUG: Could not evaluate '{expr_str}' as number, string, variable or extension. Error: {e}")
-                return expr_str
+                code = compile(expr_str, '<el-expr>', 'eval')
+            except (SyntaxError, ValueError):
+                code = None
+            self._expr_cache[expr_str] = code
+        if expr_str.isidentifier():
+            return (EXPR_VAR, (expr_str, code))
+        return (EXPR_EVAL, (expr_str, code))
+
+    def _evaluate_expression(self, expr):
+        """
+        Evaluates an expression compiled by `_compile_expression`.
+
+        Args:
+            expr (tuple): The compiled (kind, payload) expression.
 
-    def _evaluate_condition(self, condition_str):
+        Returns:
+            The evaluated value (int, float, str, or result of function call).
+        """
+        kind, payload = expr
+        return EXPR_HANDLERS[kind](self, payload)
+
+    # --- Expression handlers: each takes the expression payload and returns its value ---
+
+    def _expr_lit(self, payload):
+        return payload
+
+    def _expr_var(self, payload):
+        # Variables are the common case: one dict fetch, falling back to eval for builtins
+        try:
+            return self.vars[payload[0]]
+        except KeyError:
+            return self._expr_eval(payload)
+
+    def _expr_ext_call(self, payload):
+        return self._call_extension(*payload)
+
+    def _expr_eval(self, payload):
+        expr_str, code = payload
+        # Variable names may be any text (e.g. 'variable-x'), so check them first
+        if expr_str in self.vars:
+            return self.vars[expr_str]
+        try:
+            if code is None:
+                raise SyntaxError("invalid syntax")
+            return eval(code, {}, self.vars)
+        except (NameError, SyntaxError, TypeError) as e:
+            # If evaluation fails, it might be an unrecognized variable name or invalid expression
+            # Or it could be a string literal that wasn't quoted.
+            # For now, return the string itself if it can't be evaluated.
+            if self.debug:
+                print(f"DEBUG: Could not evaluate '{expr_str}' as number, string, variable or extension. Error: {e}")
+            return expr_str
+
+    def _compile_condition(self, condition_str):
         """
-        Evaluates a conditional expression (e.g., "variable-x = 30").
+        Parses a conditional expression (e.g., "variable-x = 30") once at load time.
 
         Args:
-            condition_str (str): The condition string to evaluate.
+            condition_str (str): The condition string to parse.
 
         Returns:
-            bool: True if the condition is met, False otherwise.
+            tuple: (COND_COMPARE, (var_name, left_expr, compare_func, operator_str, right_expr)),
+            (COND_TRUTHY, expr) or (COND_INVALID, message), with operands
+            compiled by `_compile_expression`.
         """
         parts = condition_str.split(' ')
 
         if len(parts) == 3: # Format: operand1 operator operand2 (e.g., 'var = 30')
-            var_name = parts[0]
-            operator = parts[1]
-            right_operand_str = parts[2]
+            var_name, operator_str, right_operand_str = parts
+            compare_func = CONDITION_OPERATORS.get(operator_str)
+            if compare_func is None:
+                return (COND_INVALID, f"Unsupported operator '{operator_str}' in condition.")
+            return (COND_COMPARE, (var_name, self._compile_expression(var_name), compare_func,
+                                   operator_str, self._compile_expression(right_operand_str)))
+        elif len(parts) == 1: # Format: single variable or expression (treated as boolean check)
+            return (COND_TRUTHY, self._compile_expression(parts[0]))
+        return (COND_INVALID, f"Invalid condition format: {condition_str}")
+
+    def _compile_arguments(self, args_str):
+        """
+        Splits the argument string of an extension call and compiles each argument.
+
+        Args:
+            args_str (str): The text between the call's parentheses, already stripped.
+
+        Returns:
+            tuple: The compiled argument expressions (empty if there are none).
+        """
+        if not args_str:
+            return ()
+        # This split already supports multiple arguments separated by commas.
+        return tuple(self._compile_expression(arg.strip()) for arg in args_str.split(','))
+
+    def _resolve_extension(self, method_key, context=""):
+        """
+        Looks up LIBRARY:FUNCTION in the included extensions and caches the result
+        in `self._method_cache`, printing an error if it does not exist.
+
+        Args:
+            method_key (tuple): (library_name, function_name).
+            context (str, optional): Appended to error messages (e.g. " for assignment").
+
+        Returns:
+            The callable, or None if the library or function is missing.
+        """
+        library_name, function_name = method_key
+        if library_name not in self.extensions:
+            print(f"Error: Extension library '{library_name}' not found{context}.")
+            return None
+        func = self.extensions[library_name].get(function_name)
+        if func is None:
+            print(f"Error: Function '{function_name}' not found in library '{library_name}'{context}.")
+            return None
+        self._method_cache[method_key] = func
+        return func
+
+    def _call_extension(self, method_key, arg_specs):
+        """
+        Calls LIBRARY:FUNCTION with its argument expressions evaluated.
+
+        Args:
+            method_key (tuple): (library_name, function_name).
+            arg_specs (tuple): Compiled argument expressions from `_compile_arguments`.
+
+        Returns:
+            The function's result, or None if the call could not be made or raised.
+        """
+        func = self._method_cache.get(method_key)
+        if func is None:
+            func = self._resolve_extension(method_key)
+            if func is None:
+                return None
+
+        # Recursively evaluate each argument before passing to the function
+        args = [self._evaluate_expression(arg_item) for arg_item in arg_specs]
+
+        try:
+            return func(*args) # Call the Python function with unpacked arguments
+        except Exception as e:
+            print(f"Error calling extension function {method_key[0]}:{method_key[1]}: {e}")
+            return None # Return None on error, or raise a custom EL error
+
+    def _evaluate_condition(self, condition):
+        """
+        Evaluates a condition compiled by `_compile_condition`.
+
+        Args:
+            condition (tuple): The compiled (kind, payload) condition.
+
+        Returns:
+            bool: True if the condition is met, False otherwise.
+        """
+        kind, payload = condition
+
+        if kind == COND_COMPARE:
+            var_name, left_expr, compare_func, operator_str, right_expr = payload
             
             # Evaluate the right-hand side, which can be a literal, variable, or expression
-            right_operand_value = self._evaluate_expression(right_operand_str)
+            right_operand_value = self._evaluate_expression(right_expr)
 
             # Get the value of the left-hand side variable
             var_value = None
-            if var_name in self.locals:
-                var_value = self.locals[var_name]
-            elif var_name in self.globals:
-                var_value = self.globals[var_name]
+            if var_name in self.vars:
+                var_value = self.vars[var_name]
             else:
                 # If the variable is not defined, attempt to evaluate it as an expression.
                 # This helps handle cases like `if ["hello" = "hello"]` or direct numbers.
-                var_value = self._evaluate_expression(var_name)
+                var_value = self._evaluate_expression(left_expr)
                 if var_value == var_name: # Still not found/evaluated as something else, so it's truly undefined as a var
                     print(f"Error: Variable or unrecognized expression '{var_name}' in condition.")
                     return False
 
 
-            if self.debug:
-                print(f"DEBUG: _evaluate_condition - comparing '{var_value}' (type: {type(var_value)}) {operator} '{right_operand_value}' (type: {type(right_operand_value)})")
-
-            # Attempt type coercion for numerical comparisons if types are mixed
-            try:
-                if isinstance(var_value, (int, float)) and isinstance(right_operand_value, (int, float)):
-                    # Both are numbers, direct comparison
-                    pass
-                elif (isinstance(var_value, str) and var_value.replace('.', '', 1).isdigit()) and isinstance(right_operand_value, (int, float)):
-                    # Left is numeric string, right is number -> convert left to number
-                    var_value = float(var_value) if '.' in var_value else int(var_value)
-                elif isinstance(var_value, (int, float)) and (isinstance(right_operand_value, str) and right_operand_value.replace('.', '', 1).isdigit()):
-                    # Left is number, right is numeric string -> convert right to number
-                    right_operand_value = float(right_operand_value) if '.' in right_operand_value else int(right_operand_value)
-                # If both are strings, or other types, compare directly without conversion attempt
-            except ValueError:
-                pass # Conversion failed, proceed with original types; comparison might still work or raise TypeError
-
-            if operator == "=":
-                return var_value == right_operand_value
-            elif operator == "!=":
-                return var_value != right_operand_value
-            elif operator == ">":
-                return var_value > right_operand_value
-            elif operator == "<":
-                return var_value < right_operand_value
-            elif operator == ">=":
-                return var_value >= right_operand_value
-            elif operator == "<=":
-                return var_value <= right_operand_value
-            else:
-                print(f"Unsupported operator '{operator}' in condition.")
-                return False
-        elif len(parts) == 1: # Format: single variable or expression (treated as boolean check)
-            single_value = self._evaluate_expression(parts[0])
-            return bool(single_value)
+            # Attempt type coercion for numerical comparisons if exactly one side is a number
+            is_num_left = isinstance(var_value, (int, float))
+            is_num_right = isinstance(right_operand_value, (int, float))
+            if is_num_left != is_num_right:
+                try:
+                    if is_num_left and isinstance(right_operand_value, str):
+                        # Left is number, right may be a numeric string -> convert right to number
+                        right_operand_value = float(right_operand_value)
+                    elif is_num_right and isinstance(var_value, str):
+                        # Right is number, left may be a numeric string -> convert left to number
+                        var_value = float(var_value)
+                except ValueError:
+                    pass # Not numeric, compare the original values
+
+            return compare_func(var_value, right_operand_value)
+        elif kind == COND_TRUTHY:
+            return bool(self._evaluate_expression(payload))
         else:
-            print(f"Invalid condition format: {condition_str}")
+            print(payload)
             return False
 
     def _assign_variable(self, var_name, value):
         """
-        Assigns a value to a variable, prioritizing local scope, then global.
+        Assigns a value to an existing variable.
         If the variable doesn't exist, it prints an error.
         """
-        if var_name in self.locals:
-            self.locals[var_name] = value
-        elif var_name in self.globals:
-            self.globals[var_name] = value
+        if var_name in self.vars:
+            self.vars[var_name] = value
         else:
             print(f"Error: Variable '{var_name}' not defined. Cannot assign value: {value}.")
 
+# Statement compilers, keyed by the keyword that starts the line
+STATEMENT_COMPILERS = {
+    "local": ELInterpreter._compile_local,
+    "global": ELInterpreter._compile_global,
+    "set": ELInterpreter._compile_set,
+    "jump": ELInterpreter._compile_jump,
+    ".include": ELInterpreter._compile_include,
+    "if": ELInterpreter._compile_if,
+}
+
+# Expression handlers, indexed by expression kind
+EXPR_HANDLERS = [
+    ELInterpreter._expr_lit,        # EXPR_LIT
+    ELInterpreter._expr_var,        # EXPR_VAR
+    ELInterpreter._expr_ext_call,   # EXPR_EXT_CALL
+    ELInterpreter._expr_eval,       # EXPR_EVAL
+]
+
+# Opcode handlers, indexed by opcode
+OP_HANDLERS = [
+    ELInterpreter._op_nop,          # OP_NOP
+    ELInterpreter._op_define,       # OP_DEFINE
+    ELInterpreter._op_set,          # OP_SET
+    ELInterpreter._op_set_ext_call, # OP_SET_EXT_CALL
+    ELInterpreter._op_ext_call,     # OP_EXT_CALL
+    ELInterpreter._op_jump,         # OP_JUMP
+    ELInterpreter._op_jump_if_false, # OP_JUMP_IF_FALSE
+    ELInterpreter._op_include,      # OP_INCLUDE
+    ELInterpreter._op_error,        # OP_ERROR
+    ELInterpreter._op_halt,         # OP_HALT
+    ELInterpreter._op_fused_block,  # OP_FUSED_BLOCK
+    ELInterpreter._op_ext_call_const, # OP_EXT_CALL_CONST
+]
+
+# Opcode handlers for debug runs: the same table with tracing variants swapped in
+DEBUG_OP_HANDLERS = list(OP_HANDLERS)
+DEBUG_OP_HANDLERS[OP_SET_EXT_CALL] = ELInterpreter._debug_op_set_ext_call
+DEBUG_OP_HANDLERS[OP_EXT_CALL] = ELInterpreter._debug_op_ext_call
+DEBUG_OP_HANDLERS[OP_EXT_CALL_CONST] = ELInterpreter._debug_op_ext_call_const
+DEBUG_OP_HANDLERS[OP_JUMP] = ELInterpreter._debug_op_jump
+DEBUG_OP_HANDLERS[OP_JUMP_IF_FALSE] = ELInterpreter._debug_op_jump_if_false
+
 try:
     with open(args.file, 'r') as file:
         interpreter = ELInterpreter(debug=args.debug)